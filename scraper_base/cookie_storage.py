@@ -1,5 +1,5 @@
+import json
 import os
-import pickle
 
 from selenium.webdriver.remote.webdriver import WebDriver
 
@@ -15,7 +15,11 @@ class CookieStorage:
 
     def save(self, driver: WebDriver):
         cookies = driver.get_cookies()
-        pickle.dump(cookies, file=open(self.location, "wb"))
+        # Write to a temporary file first so a crash never leaves a truncated cookie file
+        temp_location = f"{os.fspath(self.location)}.tmp"
+        with open(temp_location, "w") as f:
+            json.dump(cookies, f)
+        os.replace(temp_location, self.location)
 
     def load(self, driver: WebDriver, refresh: bool = True) -> bool:
         """Loads cookies into the web driver
@@ -28,7 +32,8 @@ class CookieStorage:
             bool: If there were cookies to load.
         """
         try:
-            cookies = pickle.load(open(self.location, "rb"))
+            with open(self.location) as f:
+                cookies = json.load(f)
             if not cookies:
                 return False
             for cookie in cookies:
@@ -36,5 +41,6 @@ class CookieStorage:
             if refresh:
                 driver.refresh()
             return True
-        except FileNotFoundError:
+        except (FileNotFoundError, ValueError):
+            # ValueError covers unreadable files, such as cookies pickled by older versions
             return False
@@ -1,13 +1,18 @@
-from typing import Union, TypeVar
+from typing import Callable, Union, TypeVar
 from enum import Enum
 import time
 import os
+import random
+import json
+import functools
+import subprocess
+import sys
 
 from selenium import webdriver
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.core.os_manager import ChromeType
+from webdriver_manager.core.os_manager import ChromeType, OperationSystemManager
 
 PathLike = Union[str, bytes, os.PathLike]
 
@@ -34,6 +39,14 @@ class WebDriverBuilder:
 
     STANDALONE_LOCAL_URL = "http://localhost:4444"
 
+    _driver_path_cache: dict[str, str] = {}
+    """Resolved driver executable paths keyed by chrome type, shared across builders"""
+
+    DRIVER_PIN_LOCATION = os.path.join(
+        os.path.expanduser("~"), ".wdm", "scraper_base_pin.json"
+    )
+    """Persists resolved driver paths per chrome type with the browser major version they match"""
+
     def __init__(
         self,
         remote_port: int = 4444,
@@ -44,6 +57,8 @@ class WebDriverBuilder:
         download_directory: PathLike | None = None,
         stealth_mode: bool = False,
         agent: str = "",
+        disable_images: bool = False,
+        page_load_strategy: str = "normal",
     ) -> None:
         self.remote_port = remote_port
         self.show_browser = show_browser
@@ -53,6 +68,8 @@ class WebDriverBuilder:
         self.agent = agent
         self.user_session_directory = user_session_directory
         self.download_directory = download_directory
+        self.disable_images = disable_images
+        self.page_load_strategy = page_load_strategy
 
     def build(
         self, driver_type: DriverType, driver_path: str | None = None
@@ -71,29 +88,47 @@ class WebDriverBuilder:
         Returns:
             WebDriver: A web driver for scraping
         """
-        match driver_type:
-            case WebDriverBuilder.DriverType.Chrome:
-                return self._build_chrome(self._chrome_options, chrome_path=driver_path)
-            case WebDriverBuilder.DriverType.Chromium:
-                return self._build_chrome(
-                    self._chrome_options,
-                    chrome_type=ChromeType.CHROMIUM,
-                    chrome_path=driver_path,
-                )
-            case WebDriverBuilder.DriverType.Standalone:
-                if self.show_browser:
-                    standalone_url = "http://localhost:7900/?autoconnect=1&resize=scale&password=secret"
-                    os.system(f"open '{standalone_url}'")
-                driver = self._build_remote(url=self.STANDALONE_LOCAL_URL)
-                if not driver:
-                    raise WebDriverBuilder.RemoteDriverTimeout
-                return driver
+        return self._DISPATCH[driver_type](self, driver_path)
+
+    def _build_standalone(self) -> WebDriver:
+        if self.show_browser:
+            standalone_url = (
+                "http://localhost:7900/?autoconnect=1&resize=scale&password=secret"
+            )
+            self._open_url(standalone_url)
+        driver = self._build_remote(url=self.STANDALONE_LOCAL_URL)
+        if not driver:
+            raise WebDriverBuilder.RemoteDriverTimeout
+        return driver
+
+    @staticmethod
+    def _open_url(url: str):
+        """Opens the url with the platform's default handler without waiting for it"""
+        if sys.platform == "win32":
+            os.startfile(url)
+            return
+        opener = "open" if sys.platform == "darwin" else "xdg-open"
+        subprocess.Popen(
+            [opener, url], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
 
     @property
     def _chrome_options(self) -> webdriver.ChromeOptions:
         opts = webdriver.ChromeOptions()
+        opts.page_load_strategy = self.page_load_strategy
         if not self.show_browser:
             opts.add_argument("--headless")
+        opts.add_argument("--window-size=1280,800")
+        opts.add_argument("--disable-background-networking")
+        opts.add_argument("--disable-default-apps")
+        opts.add_argument("--disable-translate")
+        opts.add_argument("--disable-features=Translate,MediaRouter")
+        if not self.user_session_directory:
+            # A persisted profile may rely on its extensions and sync
+            opts.add_argument("--disable-extensions")
+            opts.add_argument("--disable-sync")
+        if self.disable_images:
+            opts.add_argument("--blink-settings=imagesEnabled=false")
         if self.container:
             opts.add_argument("--no-sandbox")
             opts.add_argument("--disable-dev-shm-usage")
@@ -125,12 +160,75 @@ class WebDriverBuilder:
         Returns:
             WebDriver: A chrome web driver
         """
-        path = chrome_path or ChromeDriverManager(chrome_type=chrome_type).install()
+        path = chrome_path or self._driver_path(chrome_type)
         service = Service(executable_path=path)
         driver = webdriver.Chrome(options=options, service=service)
         self._config_driver(driver)
         return driver
 
+    @classmethod
+    def _driver_path(cls, chrome_type: str) -> str:
+        """Finds the driver executable for the chrome type, only asking
+        webdriver_manager (which hits the network) on a cache miss.
+
+        Setting the WDM_LOCAL_ONLY environment variable trusts the cached path
+        without checking that it still exists on disk.
+
+        Args:
+            chrome_type (str): The type of chrome browser.
+
+        Returns:
+            str: The path to the driver executable
+        """
+        cached = cls._driver_path_cache.get(chrome_type)
+        if cached and (os.environ.get("WDM_LOCAL_ONLY") or os.path.isfile(cached)):
+            return cached
+        chrome_major = cls._chrome_major(chrome_type)
+        pin = cls._load_pin().get(chrome_type, {})
+        if (
+            chrome_major
+            and pin.get("chrome_major") == chrome_major
+            and os.path.isfile(pin.get("path", ""))
+        ):
+            path = pin["path"]
+        else:
+            path = ChromeDriverManager(chrome_type=chrome_type).install()
+            if chrome_major:
+                cls._save_pin(chrome_type, chrome_major, path)
+        cls._driver_path_cache[chrome_type] = path
+        return path
+
+    @staticmethod
+    @functools.lru_cache
+    def _chrome_major(chrome_type: str) -> str | None:
+        """The major version of the installed browser, probed once per process"""
+        version = OperationSystemManager().get_browser_version_from_os(chrome_type)
+        return version.split(".")[0] if version else None
+
+    @classmethod
+    def _load_pin(cls) -> dict[str, dict[str, str]]:
+        try:
+            with open(cls.DRIVER_PIN_LOCATION) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @classmethod
+    def _save_pin(cls, chrome_type: str, chrome_major: str, path: str):
+        pins = cls._load_pin()
+        pins[chrome_type] = {"chrome_major": chrome_major, "path": path}
+        # Written to a per-process temporary file and moved into place, so processes
+        # resolving drivers at the same time never leave a truncated pin file
+        temp_location = f"{cls.DRIVER_PIN_LOCATION}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(cls.DRIVER_PIN_LOCATION), exist_ok=True)
+            with open(temp_location, "w") as f:
+                json.dump(pins, f)
+            os.replace(temp_location, cls.DRIVER_PIN_LOCATION)
+        except OSError:
+            # The pin only saves a version lookup, building can continue without it
+            pass
+
     def _build_remote(
         self, url: str, retry_count: int = 3, retry_delay: int = 5
     ) -> WebDriver | None:
@@ -139,22 +237,36 @@ class WebDriverBuilder:
         Args:
             url (str | None, optional): The url to connect to. Defaults to STANDALONE_LOCAL_URL
             retry_count (int): The maximum number of times to attempt to connect to the remote url
-            retry_delay (int): The delay between retries
+            retry_delay (int): The base delay between retries, doubled after each attempt
 
         Returns:
             WebDriver: A remote web driver
         """
-        if retry_count <= 0:
-            return None
-        try:
-            driver = webdriver.Remote(url)
-        except:
-            driver = None
-        if not driver:
-            time.sleep(retry_count)
-            return self._build_remote(url, retry_count=retry_count - 1)
-        self._config_driver(driver)
-        return driver
+        for attempt in range(retry_count):
+            try:
+                driver = webdriver.Remote(url)
+            except Exception:
+                if attempt < retry_count - 1:
+                    time.sleep(
+                        retry_delay * 2**attempt + random.uniform(0, retry_delay)
+                    )
+                continue
+            self._config_driver(driver)
+            return driver
+        return None
+
+    _DISPATCH: dict[
+        DriverType, Callable[["WebDriverBuilder", str | None], WebDriver]
+    ] = {
+        DriverType.Chrome: lambda self, path: self._build_chrome(
+            self._chrome_options, chrome_path=path
+        ),
+        DriverType.Chromium: lambda self, path: self._build_chrome(
+            self._chrome_options, chrome_type=ChromeType.CHROMIUM, chrome_path=path
+        ),
+        DriverType.Standalone: lambda self, path: self._build_standalone(),
+    }
+    """Builds a driver for each driver type, given the builder and an optional driver path"""
 
     def _config_driver(self, driver: WebDriver):
         if self.implicit_wait_time > 0:
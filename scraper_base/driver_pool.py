@@ -0,0 +1,151 @@
+from contextlib import contextmanager
+from typing import Generator
+import queue
+import threading
+
+from selenium.webdriver.chromium.webdriver import ChromiumDriver
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from .driver_builder import WebDriverBuilder
+
+
+class WebDriverPool:
+    """A pool of reusable web drivers, avoiding browser startup on every scrape
+
+    Usage:
+        pool = WebDriverPool(WebDriverBuilder())
+        with pool.session(WebDriverBuilder.DriverType.Chrome) as driver:
+            driver.get(url)
+        pool.close()
+
+    Released Chrome and Chromium drivers have every cookie cleared. Remote drivers
+    can only clear the cookies of the page they were on when released, so cookies
+    from other sites visited in a session survive into the next one.
+    """
+
+    def __init__(
+        self, builder: WebDriverBuilder, max_size: int = 4, max_uses: int = 50
+    ) -> None:
+        """
+        Args:
+            builder (WebDriverBuilder): The builder used to create drivers on a pool miss
+            max_size (int, optional): The maximum number of idle drivers kept per driver type. Defaults to 4.
+            max_uses (int, optional): The number of uses after which a driver is quit and rebuilt,
+            bounding the memory a long-lived browser accumulates. Defaults to 50.
+        """
+        self.builder = builder
+        self.max_size = max_size
+        self.max_uses = max_uses
+        # Idle drivers are stored with their use count
+        self._idle: dict[
+            WebDriverBuilder.DriverType, queue.LifoQueue[tuple[WebDriver, int]]
+        ] = {}
+        self._checked_out: dict[int, tuple[WebDriverBuilder.DriverType, int]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, driver_type: WebDriverBuilder.DriverType) -> WebDriver:
+        """Takes an idle driver of the specified type from the pool, building one if none are alive
+
+        Args:
+            driver_type (DriverType): The type of driver to acquire
+
+        Returns:
+            WebDriver: A web driver for scraping
+        """
+        idle = self._idle_queue(driver_type)
+        while True:
+            try:
+                driver, uses = idle.get_nowait()
+            except queue.Empty:
+                driver = self.builder.build(driver_type)
+                uses = 0
+                break
+            if self._is_alive(driver):
+                break
+            self._quit(driver)
+        with self._lock:
+            self._checked_out[id(driver)] = (driver_type, uses + 1)
+        return driver
+
+    def release(self, driver: WebDriver):
+        """Returns a driver to the pool, resetting its state for the next user
+
+        Args:
+            driver (WebDriver): A driver previously returned by `acquire`
+
+        Raises:
+            ValueError: Occurs when the driver is not checked out from this pool
+        """
+        with self._lock:
+            try:
+                driver_type, uses = self._checked_out.pop(id(driver))
+            except KeyError:
+                raise ValueError(
+                    "The driver was not acquired from this pool"
+                ) from None
+        idle = self._idle_queue(driver_type)
+        if uses >= self.max_uses or idle.qsize() >= self.max_size:
+            self._quit(driver)
+            return
+        try:
+            driver.delete_all_cookies()
+            driver.get("about:blank")
+            if isinstance(driver, ChromiumDriver):
+                # delete_all_cookies only covers the current domain
+                driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        except Exception:
+            self._quit(driver)
+            return
+        idle.put((driver, uses))
+
+    @contextmanager
+    def session(
+        self, driver_type: WebDriverBuilder.DriverType
+    ) -> Generator[WebDriver, None, None]:
+        """Acquires a driver for the duration of a `with` block
+
+        Args:
+            driver_type (DriverType): The type of driver to acquire
+        """
+        driver = self.acquire(driver_type)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def close(self):
+        """Quits every idle driver in the pool"""
+        for idle in self._idle.values():
+            while True:
+                try:
+                    driver, _ = idle.get_nowait()
+                except queue.Empty:
+                    break
+                self._quit(driver)
+
+    def _idle_queue(
+        self, driver_type: WebDriverBuilder.DriverType
+    ) -> queue.LifoQueue[tuple[WebDriver, int]]:
+        with self._lock:
+            return self._idle.setdefault(driver_type, queue.LifoQueue())
+
+    @staticmethod
+    def _is_alive(driver: WebDriver) -> bool:
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _quit(driver: WebDriver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def __enter__(self) -> "WebDriverPool":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -1,14 +1,23 @@
-import imaplib, email, enum
+import imaplib, email, email.policy, enum, threading, asyncio, functools
+import atexit, hashlib, random, re, time
+from email.message import EmailMessage
 from email.utils import parsedate_to_datetime
-from typing import Any, Generator
-from dataclasses import dataclass
-from datetime import datetime, timedelta
+from typing import Any, AsyncGenerator, Generator
+from dataclasses import dataclass, field
+from operator import attrgetter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
 
 
 class Search:
+    UNSEEN = "UNSEEN"
+    NEW = "NEW"
+    ALL = "ALL"
+    RECENT = "RECENT"
+
     @staticmethod
     def on(day: Any) -> str:
-        return f"ON {day.strftime('%d-%b-%Y')}"
+        return f"ON {_format_day(day.toordinal())}"
 
     @staticmethod
     def subject(subject: str) -> str:
@@ -16,23 +25,28 @@ class Search:
 
     @staticmethod
     def sent_since(day: Any) -> str:
-        return f"SENTSINCE {day.strftime('%d-%b-%Y')}"
+        return f"SENTSINCE {_format_day(day.toordinal())}"
 
     @staticmethod
     def unseen() -> str:
-        return "UNSEEN"
+        return Search.UNSEEN
 
     @staticmethod
     def new() -> str:
-        return "NEW"
+        return Search.NEW
 
     @staticmethod
     def all() -> str:
-        return "ALL"
+        return Search.ALL
 
     @staticmethod
     def recent() -> str:
-        return "RECENT"
+        return Search.RECENT
+
+
+@functools.lru_cache(maxsize=256)
+def _format_day(ordinal: int) -> str:
+    return date.fromordinal(ordinal).strftime("%d-%b-%Y")
 
 
 class Flag(enum.Enum):
@@ -58,19 +72,25 @@ class SearchCriteriaUnsupported(Exception):
     pass
 
 
+_GMAIL_UNSUPPORTED_TERMS = frozenset((Search.RECENT, Search.NEW))
+_QUOTED_STRING = re.compile(r'"(?:[^"\\]|\\.)*"')
+
+
 class EmailProvider(enum.Enum):
     GMAIL = "imap.gmail.com"
 
     def raise_on_invalid(self, search: str):
         match self:
             case EmailProvider.GMAIL:
-                if Search.recent() in search or Search.new() in search:
+                unquoted = _QUOTED_STRING.sub(" ", search)
+                terms = (term.strip("()") for term in unquoted.split())
+                if _GMAIL_UNSUPPORTED_TERMS.intersection(terms):
                     raise SearchCriteriaUnsupported(
                         f"A criteria in your search is unsupported by this email provider"
                     )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class EmailData:
     id: str
     to_addr: str
@@ -79,16 +99,30 @@ class EmailData:
     date: str
     text: str
     html: str
+    _dt: datetime | None = field(init=False, repr=False, compare=False)
+    _ts: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        try:
+            dt = parsedate_to_datetime(self.date)
+        except (TypeError, ValueError):
+            # Missing or malformed Date header, sorted as the oldest
+            dt = None
+        object.__setattr__(self, "_dt", dt)
+        object.__setattr__(self, "_ts", dt.timestamp() if dt else float("-inf"))
 
     @property
     def date_obj(self) -> datetime:
         # format = "%a, %d %b %y %X %Z"
         # return datetime.datetime.strptime(self.date, format)
-        return parsedate_to_datetime(self.date)
+        if self._dt is None:
+            # Raises the parsing error for the invalid date
+            return parsedate_to_datetime(self.date)
+        return self._dt
 
     @staticmethod
     def sort_by_newest(emails: list["EmailData"]):
-        emails.sort(key=lambda e: e.date_obj.timestamp(), reverse=True)
+        emails.sort(key=attrgetter("_ts"), reverse=True)
 
     def __str__(self) -> str:
         return f"""
@@ -103,17 +137,49 @@ class EmailData:
 
 
 class EmailReader:
+    FETCH_BATCH_SIZE = 50
+    """The number of messages requested per IMAP FETCH command"""
+
+    PARSE_CHUNK_SIZE = 16
+    """The number of messages sent to a parse worker process at a time"""
+
+    IDLE_TIMEOUT = 120
+    """Seconds an authenticated connection is kept warm after a reader exits"""
+
+    # Authenticated connections not currently in use, keyed by
+    # (provider, address, password digest)
+    _conn_cache: dict[tuple[str, str, str], imaplib.IMAP4_SSL] = {}
+    _idle_timers: dict[tuple[str, str, str], threading.Timer] = {}
+    _cache_lock = threading.Lock()
+
     def __init__(
         self,
         address: str,
         password: str,
         mailbox: str = "INBOX",
         provider: EmailProvider = EmailProvider.GMAIL,
+        parse_workers: int = 0,
+        max_retries: int = 3,
+        initial_delay: float = 1,
     ) -> None:
+        """
+        Args:
+            parse_workers (int, optional): The number of processes `search` uses to parse
+            each fetched batch of emails, started on first use and shut down when the reader
+            exits. Worth it for large result sets; 0 parses in this process. Defaults to 0.
+            max_retries (int, optional): The number of attempts to connect, log in and select
+            the mailbox when entering. Defaults to 3.
+            initial_delay (float, optional): The delay before the second attempt, doubled
+            after each failed attempt. Defaults to 1.
+        """
         self.address = address
         self.password = password
         self.mailbox = mailbox
         self.provider = provider
+        self.parse_workers = parse_workers
+        self.max_retries = max_retries
+        self.initial_delay = initial_delay
+        self._executor: ProcessPoolExecutor | None = None
 
     def mark_read(self, email: EmailData):
         self.connection.store(email.id, "+FLAGS", Flag.SEEN.value)
@@ -124,6 +190,9 @@ class EmailReader:
     def search(self, *searches: str) -> Generator[EmailData, Any, Any]:
         """Searches for emails with the provided IMAP criteria
 
+        Messages are fetched in batches with BODY.PEEK[], so searching does not
+        mark them as read.
+
         Args:
             search (str): The criteria used to filter emails
 
@@ -135,42 +204,264 @@ class EmailReader:
         if not self.connection:
             return []
         _, ids = self.connection.search(None, search)
-        for id in ids[0].split():
-            _, data = self.connection.fetch(id, "(RFC822)")
-            yield self.parse_email(id, data)
+        ids = ids[0].split()
+        executor = self._parse_executor()
+        for i in range(0, len(ids), self.FETCH_BATCH_SIZE):
+            batch = b",".join(ids[i : i + self.FETCH_BATCH_SIZE])
+            _, data = self.connection.fetch(batch, "(BODY.PEEK[])")
+            # Each message arrives as a (header, body) tuple followed by a closing b")"
+            messages = [part for part in data if isinstance(part, tuple)]
+            message_ids = [header.split()[0] for header, _ in messages]
+            bodies = [body for _, body in messages]
+            if executor:
+                yield from executor.map(
+                    _parse_message,
+                    message_ids,
+                    bodies,
+                    chunksize=self.PARSE_CHUNK_SIZE,
+                )
+            else:
+                yield from map(_parse_message, message_ids, bodies)
+
+    def _parse_executor(self) -> ProcessPoolExecutor | None:
+        # Started on first use and kept until the reader exits
+        if self.parse_workers <= 0:
+            return None
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.parse_workers)
+        return self._executor
+
+    async def asearch(self, *searches: str) -> AsyncGenerator[EmailData, None]:
+        """Searches for emails with the provided IMAP criteria over its own asyncio
+        connection, fetching the next batch of messages while the current one is parsed.
+
+        Requires the optional `aioimaplib` dependency (the `async` extra). Unlike
+        `search`, this does not need the reader to be entered with `with`.
+
+        Args:
+            search (str): The criteria used to filter emails
+
+        Returns:
+            AsyncGenerator[EmailData, None]: The emails matching the criteria
+        """
+        import aioimaplib
+
+        search = " ".join(searches)
+        self.provider.raise_on_invalid(search)
+        client = aioimaplib.IMAP4_SSL(self.provider.value)
+        await client.wait_hello_from_server()
+        next_batch: asyncio.Task[Any] | None = None
+        try:
+            self._check_response(
+                "LOGIN", await client.login(self.address, self.password)
+            )
+            self._check_response("SELECT", await client.select(self.mailbox))
+            response = await client.search(search, charset=None)
+            self._check_response("SEARCH", response)
+            ids = response.lines[0].decode().split()
+            batches = [
+                ",".join(ids[i : i + self.FETCH_BATCH_SIZE])
+                for i in range(0, len(ids), self.FETCH_BATCH_SIZE)
+            ]
+            loop = asyncio.get_running_loop()
+            for i, batch in enumerate(batches):
+                if next_batch is None:
+                    next_batch = asyncio.ensure_future(
+                        client.fetch(batch, "(BODY.PEEK[])")
+                    )
+                response = await next_batch
+                next_batch = None
+                self._check_response("FETCH", response)
+                if i + 1 < len(batches):
+                    next_batch = asyncio.ensure_future(
+                        client.fetch(batches[i + 1], "(BODY.PEEK[])")
+                    )
+                    # Let the prefetch send its command before parsing starts
+                    await asyncio.sleep(0)
+                # Parsing off the event loop lets the prefetched bytes arrive meanwhile
+                emails = await loop.run_in_executor(
+                    None, _parse_fetch_lines, response.lines
+                )
+                for parsed in emails:
+                    yield parsed
+        finally:
+            if next_batch is not None:
+                next_batch.cancel()
+            await client.logout()
+
+    @staticmethod
+    def _check_response(command: str, response: Any):
+        # aioimaplib reports NO and BAD replies in the response instead of raising
+        if response.result != "OK":
+            raise imaplib.IMAP4.error(
+                f"{command} command error: {response.result} {response.lines}"
+            )
 
     def parse_email(self, id: str, data: Any) -> EmailData:
-        msg = email.message_from_bytes(data[0][1])
-        date = msg.get("Date", "")
-        subject = msg.get("Subject", "")
-        from_address = msg.get("From", "")
-        to_address = msg.get("To", "")
-        text = ""
-        html = ""
-        for part in msg.walk():
-            match part.get_content_type():
-                case "text/plain":
-                    text += part.get_payload(decode=True).decode()
-                case "text/html":
-                    html += part.get_payload(decode=True).decode()
-                case _:
-                    continue
-        return EmailData(id, to_address, from_address, subject, date, text, html)
+        return _parse_message(id, data[0][1])
+
+    @classmethod
+    def purge(cls):
+        """Logs out of every cached connection"""
+        with cls._cache_lock:
+            connections = list(cls._conn_cache.values())
+            cls._conn_cache.clear()
+            for timer in cls._idle_timers.values():
+                timer.cancel()
+            cls._idle_timers.clear()
+        for connection in connections:
+            cls._logout(connection)
 
-    def __enter__(self) -> "EmailReader":
-        self.connection = imaplib.IMAP4_SSL(self.provider.value)
+    @property
+    def _cache_key(self) -> tuple[str, str, str]:
+        # The password digest stops a reader with the wrong password reusing a login
+        password_digest = hashlib.sha256(self.password.encode()).hexdigest()
+        return (self.provider.value, self.address, password_digest)
+
+    def _checkout_connection(self) -> imaplib.IMAP4_SSL | None:
+        with self._cache_lock:
+            connection = self._conn_cache.pop(self._cache_key, None)
+            timer = self._idle_timers.pop(self._cache_key, None)
+        if timer:
+            timer.cancel()
+        if not connection:
+            return None
+        try:
+            if connection.noop()[0] == "OK":
+                return connection
+        except (imaplib.IMAP4.error, OSError):
+            pass
+        self._logout(connection)
+        return None
+
+    def _checkin_connection(self, connection: imaplib.IMAP4_SSL):
+        key = self._cache_key
+        with self._cache_lock:
+            if key in self._conn_cache:
+                # Another reader already returned a connection for this account
+                duplicate = True
+            else:
+                duplicate = False
+                self._conn_cache[key] = connection
+                timer = threading.Timer(
+                    self.IDLE_TIMEOUT, self._expire_connection, (key, connection)
+                )
+                timer.daemon = True
+                self._idle_timers[key] = timer
+                timer.start()
+        if duplicate:
+            self._logout(connection)
+
+    @classmethod
+    def _expire_connection(
+        cls, key: tuple[str, str, str], connection: imaplib.IMAP4_SSL
+    ):
+        with cls._cache_lock:
+            if cls._conn_cache.get(key) is not connection:
+                return
+            del cls._conn_cache[key]
+            cls._idle_timers.pop(key, None)
+        cls._logout(connection)
+
+    @staticmethod
+    def _logout(connection: imaplib.IMAP4_SSL):
         try:
-            self.connection.login(self.address, self.password)
-            self.connection.select(self.mailbox)
-        except imaplib.IMAP4.error as e:
-            raise e
-        return self
+            connection.logout()
+        except (imaplib.IMAP4.error, OSError):
+            pass
+
+    def __enter__(self) -> "EmailReader":
+        attempts = max(self.max_retries, 1)
+        for attempt in range(attempts):
+            connection = self._checkout_connection()
+            try:
+                if not connection:
+                    connection = imaplib.IMAP4_SSL(self.provider.value)
+                    connection.login(self.address, self.password)
+                connection.select(self.mailbox)
+            except (imaplib.IMAP4.error, OSError):
+                if connection:
+                    self._logout(connection)
+                if attempt == attempts - 1:
+                    raise
+                time.sleep(self.initial_delay * 2**attempt + random.random())
+            else:
+                self.connection = connection
+                return self
 
     def __exit__(self, *args):
+        if self._executor:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
         if not self.connection:
             return
-        self.connection.close()
-        self.connection.logout()
+        connection, self.connection = self.connection, None
+        try:
+            connection.close()
+        except (imaplib.IMAP4.error, OSError):
+            # Dropped socket or no mailbox selected, the connection can't be reused
+            self._logout(connection)
+            return
+        # Leave the authenticated connection open for the next reader
+        self._checkin_connection(connection)
+
+
+# Idle timers are daemon threads, so log out of warm connections at exit
+atexit.register(EmailReader.purge)
+
+
+def _parse_fetch_lines(lines: list[Any]) -> list[EmailData]:
+    # Each message arrives as a header line followed by its bytes
+    emails: list[EmailData] = []
+    header = b""
+    for line in lines:
+        if isinstance(line, bytearray):
+            emails.append(_parse_message(header.split()[0], bytes(line)))
+        else:
+            header = line
+    return emails
+
+
+def _parse_message(id: str, raw: bytes) -> EmailData:
+    # Module level so it can be sent to worker processes
+    msg = email.message_from_bytes(raw, policy=email.policy.default)
+    date = str(msg.get("Date", ""))
+    subject = str(msg.get("Subject", ""))
+    from_address = str(msg.get("From", ""))
+    to_address = str(msg.get("To", ""))
+    text, html = _body_contents(msg)
+    return EmailData(id, to_address, from_address, subject, date, text, html)
+
+
+def _body_contents(msg: EmailMessage) -> tuple[str, str]:
+    # One pass over the MIME tree collecting every inline text/plain and text/html
+    # part, a mixed message may split its text around images or other parts.
+    # Attachments and attached messages are not descended into.
+    text: list[str] = []
+    html: list[str] = []
+    stack = [msg]
+    while stack:
+        part = stack.pop()
+        if part.is_multipart():
+            stack.extend(
+                child
+                for child in reversed(list(part.iter_parts()))
+                if child.get_content_disposition() != "attachment"
+                and child.get_content_maintype() != "message"
+            )
+        elif part.get_content_type() == "text/plain":
+            text.append(_decode_part(part))
+        elif part.get_content_type() == "text/html":
+            html.append(_decode_part(part))
+    return "".join(text), "".join(html)
+
+
+def _decode_part(part: EmailMessage) -> str:
+    try:
+        return part.get_content()
+    except LookupError:
+        # Unknown charset declared by the sender
+        return part.get_payload(decode=True).decode("utf-8", errors="replace")
 
 
 def main():
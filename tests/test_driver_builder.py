@@ -0,0 +1,86 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from webdriver_manager.core.os_manager import ChromeType
+
+from scraper_base.driver_builder import WebDriverBuilder
+
+
+class TestDriverPath(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.driver = os.path.join(directory.name, "chromedriver")
+        open(self.driver, "w").close()
+        self.installed = os.path.join(directory.name, "installed")
+        open(self.installed, "w").close()
+
+        pin_location = os.path.join(directory.name, "wdm", "pin.json")
+        patches = [
+            mock.patch.object(WebDriverBuilder, "DRIVER_PIN_LOCATION", pin_location),
+            mock.patch.object(WebDriverBuilder, "_driver_path_cache", {}),
+            mock.patch.object(WebDriverBuilder, "_chrome_major", return_value="120"),
+            mock.patch.dict(os.environ),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        os.environ.pop("WDM_LOCAL_ONLY", None)
+
+        manager = mock.patch("scraper_base.driver_builder.ChromeDriverManager")
+        self.manager = manager.start()
+        self.addCleanup(manager.stop)
+        self.manager.return_value.install.return_value = self.installed
+
+    def resolve(self) -> str:
+        return WebDriverBuilder._driver_path(ChromeType.GOOGLE)
+
+    def write_pin(self, chrome_major: str, path: str):
+        WebDriverBuilder._save_pin(ChromeType.GOOGLE, chrome_major, path)
+
+    def test_installs_and_pins_on_cold_start(self):
+        self.assertEqual(self.resolve(), self.installed)
+        self.manager.assert_called_once()
+        with open(WebDriverBuilder.DRIVER_PIN_LOCATION) as f:
+            pins = json.load(f)
+        self.assertEqual(
+            pins[ChromeType.GOOGLE], {"chrome_major": "120", "path": self.installed}
+        )
+        pin_directory = os.path.dirname(WebDriverBuilder.DRIVER_PIN_LOCATION)
+        self.assertEqual(os.listdir(pin_directory), ["pin.json"])
+
+    def test_in_process_cache_hit(self):
+        WebDriverBuilder._driver_path_cache[ChromeType.GOOGLE] = self.driver
+        self.assertEqual(self.resolve(), self.driver)
+        self.manager.assert_not_called()
+
+    def test_pin_hit_with_matching_major(self):
+        self.write_pin("120", self.driver)
+        self.assertEqual(self.resolve(), self.driver)
+        self.manager.assert_not_called()
+
+    def test_pin_ignored_on_major_mismatch(self):
+        self.write_pin("119", self.driver)
+        self.assertEqual(self.resolve(), self.installed)
+        self.manager.assert_called_once()
+
+    def test_pin_ignored_when_driver_is_missing(self):
+        self.write_pin("120", self.driver + "-deleted")
+        self.assertEqual(self.resolve(), self.installed)
+        self.manager.assert_called_once()
+
+    def test_local_only_trusts_cached_path(self):
+        missing = self.driver + "-deleted"
+        WebDriverBuilder._driver_path_cache[ChromeType.GOOGLE] = missing
+        self.assertEqual(self.resolve(), self.installed)
+        os.environ["WDM_LOCAL_ONLY"] = "1"
+        WebDriverBuilder._driver_path_cache[ChromeType.GOOGLE] = missing
+        self.assertEqual(self.resolve(), missing)
+        self.manager.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
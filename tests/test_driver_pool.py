@@ -0,0 +1,95 @@
+import unittest
+from unittest import mock
+
+from selenium.webdriver.chromium.webdriver import ChromiumDriver
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from scraper_base.driver_builder import WebDriverBuilder
+from scraper_base.driver_pool import WebDriverPool
+
+Chrome = WebDriverBuilder.DriverType.Chrome
+
+
+class StubBuilder:
+    """Builds mock drivers, recording each one"""
+
+    def __init__(self, spec: type = WebDriver):
+        self.spec = spec
+        self.built: list[mock.Mock] = []
+
+    def build(self, driver_type):
+        driver = mock.Mock(spec=self.spec)
+        self.built.append(driver)
+        return driver
+
+
+class TestWebDriverPool(unittest.TestCase):
+    def test_reuses_released_driver(self):
+        builder = StubBuilder()
+        pool = WebDriverPool(builder)
+        with pool.session(Chrome) as first:
+            pass
+        with pool.session(Chrome) as second:
+            pass
+        self.assertIs(first, second)
+        self.assertEqual(len(builder.built), 1)
+
+    def test_replaces_dead_idle_driver(self):
+        builder = StubBuilder()
+        pool = WebDriverPool(builder)
+        with pool.session(Chrome) as dead:
+            pass
+        type(dead).current_url = mock.PropertyMock(side_effect=Exception("gone"))
+        with pool.session(Chrome) as driver:
+            self.assertIsNot(driver, dead)
+        dead.quit.assert_called_once()
+
+    def test_recycles_after_max_uses(self):
+        builder = StubBuilder()
+        pool = WebDriverPool(builder, max_uses=2)
+        for _ in range(2):
+            with pool.session(Chrome) as driver:
+                pass
+        driver.quit.assert_called_once()
+        with pool.session(Chrome) as fresh:
+            self.assertIsNot(fresh, driver)
+
+    def test_quits_drivers_beyond_max_size(self):
+        builder = StubBuilder()
+        pool = WebDriverPool(builder, max_size=1)
+        first = pool.acquire(Chrome)
+        second = pool.acquire(Chrome)
+        pool.release(first)
+        pool.release(second)
+        first.quit.assert_not_called()
+        second.quit.assert_called_once()
+
+    def test_quits_driver_when_reset_fails(self):
+        builder = StubBuilder()
+        pool = WebDriverPool(builder)
+        driver = pool.acquire(Chrome)
+        driver.get.side_effect = Exception("crashed")
+        pool.release(driver)
+        driver.quit.assert_called_once()
+        self.assertIsNot(pool.acquire(Chrome), driver)
+
+    def test_clears_all_cookies_only_for_chromium_drivers(self):
+        for spec, clears in ((ChromiumDriver, True), (WebDriver, False)):
+            with self.subTest(spec=spec.__name__):
+                pool = WebDriverPool(StubBuilder(spec))
+                with pool.session(Chrome) as driver:
+                    pass
+                driver.delete_all_cookies.assert_called_once()
+                cdp_calls = [
+                    call for call in driver.method_calls if call[0] == "execute_cdp_cmd"
+                ]
+                self.assertEqual(len(cdp_calls), 1 if clears else 0)
+
+    def test_release_rejects_unknown_driver(self):
+        pool = WebDriverPool(StubBuilder())
+        with self.assertRaises(ValueError):
+            pool.release(mock.Mock(spec=WebDriver))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,282 @@
+import asyncio
+import imaplib
+import unittest
+from email.message import EmailMessage
+from types import SimpleNamespace
+from unittest import mock
+
+from scraper_base.email_reader import (
+    EmailProvider,
+    EmailReader,
+    Search,
+    SearchCriteriaUnsupported,
+)
+
+
+def build_message(subject: str, text: str) -> bytes:
+    msg = EmailMessage()
+    msg["Subject"] = subject
+    msg["Date"] = "Mon, 1 Jan 2024 10:00:00 +0000"
+    msg.set_content(text)
+    return msg.as_bytes()
+
+
+class StubConnection:
+    """Answers SEARCH and FETCH the way imaplib.IMAP4_SSL does"""
+
+    def __init__(
+        self, messages: dict[bytes, bytes], unsolicited: list[bytes] | None = None
+    ):
+        self.messages = messages
+        self.unsolicited = unsolicited or []
+        self.fetches: list[bytes] = []
+
+    def search(self, charset, criteria):
+        return "OK", [b" ".join(self.messages)]
+
+    def fetch(self, message_set: bytes, parts: str):
+        self.fetches.append(message_set)
+        data: list = []
+        for id in message_set.split(b","):
+            raw = self.messages[id]
+            data.append((id + b" (BODY[] {%d}" % len(raw), raw))
+            data.append(b")")
+        return "OK", data + self.unsolicited
+
+
+class TestSearch(unittest.TestCase):
+    def test_batched_fetch_pairs_ids_with_bodies(self):
+        reader = EmailReader("user", "password")
+        reader.connection = StubConnection(
+            {
+                b"1": build_message("first", "one"),
+                b"2": build_message("second", "two"),
+                b"3": build_message("third", "three"),
+            },
+            unsolicited=[b"2 (FLAGS (\\Seen))"],
+        )
+        emails = list(reader.search("ALL"))
+        self.assertEqual(reader.connection.fetches, [b"1,2,3"])
+        self.assertEqual(
+            [(e.id, e.subject, e.text.strip()) for e in emails],
+            [(b"1", "first", "one"), (b"2", "second", "two"), (b"3", "third", "three")],
+        )
+
+    def test_fetches_in_batches(self):
+        reader = EmailReader("user", "password")
+        reader.FETCH_BATCH_SIZE = 2
+        reader.connection = StubConnection(
+            {str(i).encode(): build_message(f"s{i}", f"t{i}") for i in range(1, 6)}
+        )
+        emails = list(reader.search("ALL"))
+        self.assertEqual(reader.connection.fetches, [b"1,2", b"3,4", b"5"])
+        self.assertEqual([e.subject for e in emails], ["s1", "s2", "s3", "s4", "s5"])
+
+    def test_parses_in_worker_processes(self):
+        reader = EmailReader("user", "password", parse_workers=2)
+        reader.FETCH_BATCH_SIZE = 20
+        reader.connection = StubConnection(
+            {str(i).encode(): build_message(f"s{i}", f"t{i}") for i in range(1, 41)}
+        )
+        emails = list(reader.search("ALL"))
+        executor = reader._executor
+        self.assertIsNotNone(executor)
+        self.assertEqual([e.subject for e in emails], [f"s{i}" for i in range(1, 41)])
+        list(reader.search("ALL"))
+        self.assertIs(reader._executor, executor)
+        reader.connection = None
+        reader.__exit__(None, None, None)
+        self.assertIsNone(reader._executor)
+
+
+class TestRaiseOnInvalid(unittest.TestCase):
+    def test_gmail_rejects_unsupported_terms(self):
+        for search in ("RECENT", "UNSEEN NEW", "(RECENT)", "OR (NEW) UNSEEN"):
+            with self.subTest(search=search):
+                with self.assertRaises(SearchCriteriaUnsupported):
+                    EmailProvider.GMAIL.raise_on_invalid(search)
+
+    def test_gmail_allows_terms_inside_quoted_subjects(self):
+        for search in (
+            'UNSEEN SUBJECT "NEW"',
+            Search.subject("What's NEW today"),
+            Search.subject('Say \\"RECENT\\" twice'),
+        ):
+            with self.subTest(search=search):
+                EmailProvider.GMAIL.raise_on_invalid(search)
+        with self.assertRaises(SearchCriteriaUnsupported):
+            EmailProvider.GMAIL.raise_on_invalid(Search.subject("NEW") + " NEW")
+
+
+class TestParseEmail(unittest.TestCase):
+    def parse(self, raw: bytes):
+        return EmailReader("user", "password").parse_email(b"1", [(b"1", raw)])
+
+    def test_unknown_charset_falls_back_to_utf8(self):
+        email = self.parse(b"Content-Type: text/plain; charset=x-bogus\r\n\r\nhello")
+        self.assertEqual(email.text, "hello")
+
+    def test_joins_inline_text_around_other_parts(self):
+        msg = EmailMessage()
+        msg.set_content("part one")
+        msg.add_attachment(
+            b"png", maintype="image", subtype="png", disposition="inline"
+        )
+        second = EmailMessage()
+        second.set_content("part two")
+        msg.attach(second)
+        msg.add_attachment("attached", filename="notes.txt")
+        self.assertEqual(self.parse(msg.as_bytes()).text, "part one\npart two\n")
+
+    def test_skips_attached_messages(self):
+        inner = EmailMessage()
+        inner["Subject"] = "forwarded"
+        inner.set_content("inner body")
+        inner.add_alternative("<p>inner</p>", subtype="html")
+        msg = EmailMessage()
+        msg.set_content("outer body")
+        msg.add_alternative("<p>outer</p>", subtype="html")
+        msg.add_attachment(inner)
+        email = self.parse(msg.as_bytes())
+        self.assertEqual((email.text, email.html), ("outer body\n", "<p>outer</p>\n"))
+
+
+class StubIMAP:
+    """Stands in for imaplib.IMAP4_SSL, recording the commands it receives"""
+
+    def __init__(self, host: str):
+        self.commands: list[str] = []
+        self.fail_close = False
+
+    def login(self, address, password):
+        self.commands.append("LOGIN")
+        self.password = password
+
+    def select(self, mailbox):
+        self.commands.append("SELECT")
+
+    def noop(self):
+        self.commands.append("NOOP")
+        return "OK", [b""]
+
+    def close(self):
+        self.commands.append("CLOSE")
+        if self.fail_close:
+            raise imaplib.IMAP4.abort("socket error")
+
+    def logout(self):
+        self.commands.append("LOGOUT")
+
+
+@mock.patch("imaplib.IMAP4_SSL", StubIMAP)
+class TestConnectionCache(unittest.TestCase):
+    def tearDown(self):
+        EmailReader.purge()
+
+    def test_reuses_connection_for_same_credentials(self):
+        with EmailReader("user", "password") as reader:
+            first = reader.connection
+        with EmailReader("user", "password") as reader:
+            self.assertIs(reader.connection, first)
+        self.assertEqual(first.commands.count("LOGIN"), 1)
+
+    def test_does_not_reuse_connection_with_wrong_password(self):
+        with EmailReader("user", "password") as reader:
+            first = reader.connection
+        with EmailReader("user", "wrong") as reader:
+            self.assertIsNot(reader.connection, first)
+            self.assertEqual(reader.connection.password, "wrong")
+
+    def test_logs_out_when_close_fails(self):
+        with EmailReader("user", "password") as reader:
+            connection = reader.connection
+            connection.fail_close = True
+        self.assertEqual(connection.commands[-1], "LOGOUT")
+        with EmailReader("user", "password") as reader:
+            self.assertIsNot(reader.connection, connection)
+
+
+class StubAsyncIMAP:
+    """Stands in for aioimaplib.IMAP4_SSL, serving numbered messages"""
+
+    search_result = "OK"
+    message_count = 1
+
+    def __init__(self, host: str):
+        self.events: list[str] = []
+
+    async def wait_hello_from_server(self):
+        pass
+
+    async def login(self, address, password):
+        return SimpleNamespace(result="OK", lines=[b"LOGIN completed"])
+
+    async def select(self, mailbox):
+        return SimpleNamespace(result="OK", lines=[b"Select completed"])
+
+    async def search(self, criteria, charset):
+        if self.search_result != "OK":
+            return SimpleNamespace(
+                result=self.search_result, lines=[b"Invalid search criteria"]
+            )
+        ids = " ".join(str(i) for i in range(1, self.message_count + 1))
+        return SimpleNamespace(result="OK", lines=[ids.encode(), b"SEARCH completed"])
+
+    async def fetch(self, message_set, parts):
+        self.events.append(f"fetch {message_set}")
+        await asyncio.sleep(0)
+        lines: list = []
+        for id in message_set.split(","):
+            raw = build_message(f"s{id}", f"t{id}")
+            header = b"%s FETCH (BODY[] {%d}" % (id.encode(), len(raw))
+            lines += [header, bytearray(raw), b")"]
+        return SimpleNamespace(result="OK", lines=lines + [b"FETCH completed"])
+
+    async def logout(self):
+        pass
+
+
+class TestAsyncSearch(unittest.TestCase):
+    def collect(self, search_result: str = "OK", message_count: int = 1):
+        client_type = type(
+            "Client",
+            (StubAsyncIMAP,),
+            {"search_result": search_result, "message_count": message_count},
+        )
+        clients: list[StubAsyncIMAP] = []
+
+        def create_client(host: str) -> StubAsyncIMAP:
+            clients.append(client_type(host))
+            return clients[-1]
+
+        async def run():
+            reader = EmailReader("user", "password")
+            reader.FETCH_BATCH_SIZE = 2
+            emails = []
+            async for email in reader.asearch("ALL"):
+                clients[0].events.append(f"yield {email.id.decode()}")
+                emails.append(email)
+            return emails, clients[0].events
+
+        stub_module = SimpleNamespace(IMAP4_SSL=create_client)
+        with mock.patch.dict("sys.modules", {"aioimaplib": stub_module}):
+            return asyncio.run(run())
+
+    def test_yields_fetched_emails(self):
+        emails, _ = self.collect(message_count=3)
+        self.assertEqual(
+            [(e.id, e.subject) for e in emails],
+            [(b"1", "s1"), (b"2", "s2"), (b"3", "s3")],
+        )
+
+    def test_next_batch_is_fetched_before_current_batch_is_yielded(self):
+        _, events = self.collect(message_count=4)
+        self.assertLess(events.index("fetch 3,4"), events.index("yield 1"))
+
+    def test_raises_when_search_fails(self):
+        with self.assertRaises(imaplib.IMAP4.error):
+            self.collect("BAD")
+
+
+if __name__ == "__main__":
+    unittest.main()